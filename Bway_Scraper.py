@@ -81,7 +81,6 @@ def scrape_weekly_show_data(url):
         """
         
         # Create DataFrame with all four columns
-        data = []
         max_length = max(len(weeks), len(shows), len(gross), len(attendance))
         
         # Check if all lists have the same length
@@ -92,18 +91,22 @@ def scrape_weekly_show_data(url):
         # Use minimum length to ensure data integrity
         min_length = min(len(weeks), len(shows), len(gross), len(attendance))
         
+        # Read the clock once and pre-size the rows list
+        scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        data = [None] * min_length
+        
         for i in range(min_length):
             # Clean up the data
             clean_gross = gross[i].replace(',', '')  # Remove commas from gross
             clean_attendance = attendance[i].replace(',', '')  # Remove commas from attendance
             
-            data.append({
+            data[i] = {
                 'Week_Ending': weeks[i],
                 'Gross_Gross': int(clean_gross),
                 'Total_Attendance': int(clean_attendance),
                 'Number_of_Shows': int(shows[i]),
-                'Scraped_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            })
+                'Scraped_Date': scraped_at
+            }
         
         df = pd.DataFrame(data)
         
@@ -153,10 +156,24 @@ def save_to_excel(df, filename=None):
             number_style = NamedStyle(name='number_comma')
             number_style.number_format = '#,##0'
             
-            # Apply formatting to columns
-            for row in range(2, len(df) + 2):  # Start from row 2 (skip header)
-                worksheet[f'B{row}'].style = currency_style  # Gross_Gross column
-                worksheet[f'C{row}'].style = number_style    # Total_Attendance column
+            # Register the styles once, then apply them by name
+            workbook.add_named_style(currency_style)
+            workbook.add_named_style(number_style)
+            
+            # Apply formatting to columns, skipping the header row
+            for gross_cell, attendance_cell in worksheet.iter_rows(min_row=2, min_col=2, max_col=3):
+                gross_cell.style = 'currency'           # Gross_Gross column
+                attendance_cell.style = 'number_comma'  # Total_Attendance column
+            
+            # Set column widths
+            column_widths = {
+                'A': 15,  # Week_Ending
+                'B': 15,  # Gross_Gross
+                'C': 18,  # Total_Attendance
+                'D': 15,  # Number_of_Shows
+                'E': 20   # Scraped_Date
+            }
+            
             for col_letter, width in column_widths.items():
                 worksheet.column_dimensions[col_letter].width = width
         
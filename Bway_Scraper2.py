@@ -1,8 +1,279 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import re
+import html
+import codecs
+import os
+import json
+import hashlib
+import time
+import logging
+
+_log = logging.getLogger(__name__)
+
+# Prefer RE2's linear-time DFA engine for scanning the page, falling back
+# to stdlib re when google-re2 is not installed. RE2's \s and \d are
+# ASCII-only, so the label pattern spells out the non-breaking space that
+# html.unescape produces for &nbsp; and uses [0-9] for digits
+try:
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+# lxml is the faster tree builder for the fallback parse, but it's optional;
+# use the stdlib parser when it's missing
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# Numba is only worth its JIT start-up cost on multi-season archives with
+# thousands of rows; smaller pages use the pandas string path
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_NUMBA_MIN_ROWS = 1024
+_INT64_MAX = np.iinfo(np.int64).max
+
+# Shared session so repeated scrapes reuse pooled connections
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=Retry(total=3, backoff_factor=0.3))
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+# Sidecar files for conditional requests: ETag/Last-Modified per URL plus
+# the DataFrame built from that response, reused when the server says 304
+_CACHE_DIR = '.scrape_cache'
+_HTTP_CACHE_FILE = os.path.join(_CACHE_DIR, 'http_cache.json')
+
+# In-process results by URL, kept for 15 minutes so repeated calls in the
+# same run skip the request entirely
+_RESULT_CACHE = {}
+_RESULT_TTL = 900
+
+# <meta charset="..."> or <meta http-equiv=... content="...; charset=...">
+# near the top of the page, for when the server doesn't send a charset
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+
+# Precompiled patterns for the weekly grosses labels
+_TAG_RE = _re_engine.compile(r'<[^>]+>')
+# All four labels in one alternation so the page is scanned once; the
+# named group that matched tells us which field the value belongs to
+_LABELS_RE = _re_engine.compile(
+    r'Week Ending:[\s\xa0]*(?P<week>[0-9]{1,2}/[0-9]{1,2}/[0-9]{4})'
+    r'|Number of Shows:[\s\xa0]*(?P<shows>[0-9]+)'
+    r'|Gross Gross:[\s\xa0]*\$?(?P<gross>[0-9,]+)'
+    r'|Total Attendance:[\s\xa0]*(?P<attendance>[0-9,]+)'
+)
+# Limits the fallback BeautifulSoup parse to text nodes holding a label
+_LABEL_STRAINER = SoupStrainer(string=re.compile(r'Week Ending:|Number of Shows:|Gross Gross:|Total Attendance:'))
+
+if njit is not None:
+    @njit(cache=True)
+    def _parse_int_buffer(buf, n):
+        # buf holds ASCII digit strings joined by ';', commas are skipped.
+        # Values the pandas path rejects are flagged in bad (and left as 0):
+        # no digits at all (e.g. a bare ','), or too large for int64
+        out = np.zeros(n, dtype=np.int64)
+        bad = np.zeros(n, dtype=np.bool_)
+        i = 0
+        value = 0
+        digits = 0
+        for b in buf:
+            if b == 59:  # ';'
+                if digits == 0 or bad[i]:
+                    bad[i] = True
+                else:
+                    out[i] = value
+                i += 1
+                value = 0
+                digits = 0
+            elif b != 44 and not bad[i]:  # ','
+                d = np.int64(b) - 48
+                if value > (_INT64_MAX - d) // 10:
+                    bad[i] = True
+                else:
+                    value = value * 10 + d
+                    digits += 1
+        if digits == 0 or bad[i]:
+            bad[i] = True
+        else:
+            out[i] = value
+        return out, bad
+else:
+    _parse_int_buffer = None
+
+def _to_int_column(values):
+    """
+    Converts comma-separated number strings to an int64 array
+    
+    Args:
+        values (list): Strings such as '1,234,567'
+    
+    Returns:
+        tuple: The parsed integers (0 where a value is bad) and a boolean
+        array marking values that are empty or don't fit in int64
+    """
+    if _parse_int_buffer is not None and len(values) > _NUMBA_MIN_ROWS:
+        buf = np.frombuffer(';'.join(values).encode('ascii'), dtype=np.uint8)
+        return _parse_int_buffer(buf, len(values))
+    
+    digits = pd.Series(values, dtype=object).str.replace(',', '', regex=False)
+    # to_numeric only flags bad values; it goes through float64 once any
+    # value is missing, so int64 range is checked on the digit strings and
+    # the good values are cast from the strings exactly
+    significant = digits.str.lstrip('0')
+    too_big = (significant.str.len() > 19) | ((significant.str.len() == 19) & (significant > str(_INT64_MAX)))
+    bad = (pd.to_numeric(digits, errors='coerce').isna() | too_big).to_numpy()
+    out = np.zeros(len(values), dtype=np.int64)
+    out[~bad] = digits[~bad].astype('int64').to_numpy()
+    return out, bad
+
+def _page_encoding(response, head):
+    """
+    Picks the encoding to decode the page with
+    
+    requests falls back to ISO-8859-1 for any text/html response without a
+    charset, so only a charset from the Content-Type header is trusted; after
+    that the page's own meta tag is used, then UTF-8.
+    
+    Args:
+        response (requests.Response): The page response
+        head (bytes): First chunk of the body
+    
+    Returns:
+        str: A codec name known to Python
+    """
+    candidates = []
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        candidates.append(response.encoding)
+    match = _META_CHARSET_RE.search(head)
+    if match:
+        candidates.append(match.group(1).decode('ascii'))
+    
+    for encoding in candidates:
+        try:
+            return codecs.lookup(encoding).name
+        except (LookupError, TypeError):
+            continue
+    return 'utf-8'
+
+def _narrow_int(values, dtype):
+    """
+    Casts an int64 array to a smaller integer dtype if every value fits
+    
+    Args:
+        values (numpy.ndarray): int64 values
+        dtype (str): Target dtype such as 'int32'
+    
+    Returns:
+        numpy.ndarray: The narrowed array, or the int64 one unchanged if any
+        value is out of range (astype would silently wrap it)
+    """
+    limits = np.iinfo(dtype)
+    if len(values) and (values.min() < limits.min or values.max() > limits.max):
+        return values
+    return values.astype(dtype)
+
+def _scan_labels(texts):
+    """
+    Runs the fused label pattern over one or more strings
+    
+    Args:
+        texts (iterable): Page text, or individual HTML text nodes
+    
+    Returns:
+        tuple: Lists of week, shows, gross and attendance strings
+    """
+    found = {'week': [], 'shows': [], 'gross': [], 'attendance': []}
+    for text in texts:
+        for match in _LABELS_RE.finditer(text):
+            found[match.lastgroup].append(match.group(match.lastgroup))
+    return found['week'], found['shows'], found['gross'], found['attendance']
+
+def _load_http_cache():
+    """
+    Loads the saved validators for previously scraped URLs
+    
+    Returns:
+        dict: Maps URL to its 'etag', 'last_modified' and 'frame' path
+    """
+    try:
+        with open(_HTTP_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _forget_http_cache(url):
+    """
+    Removes the saved validators and DataFrame for a URL
+    
+    Args:
+        url (str): The scraped URL
+    """
+    cache = _load_http_cache()
+    entry = cache.pop(url, None)
+    if entry is None:
+        return
+    
+    try:
+        if os.path.exists(entry.get('frame', '')):
+            os.remove(entry['frame'])
+        with open(_HTTP_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not update scrape cache: {e}")
+
+def _save_http_cache(url, response, df):
+    """
+    Stores the response validators and the resulting DataFrame for a URL
+    
+    Args:
+        url (str): The scraped URL
+        response (requests.Response): Response the DataFrame was built from
+        df (pandas.DataFrame): Data to return on a later 304
+    """
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not (etag or last_modified):
+        return
+    
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        frame_path = os.path.join(_CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.pkl')
+        df.to_pickle(frame_path)
+        
+        cache = _load_http_cache()
+        cache[url] = {'etag': etag, 'last_modified': last_modified, 'frame': frame_path}
+        with open(_HTTP_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not update scrape cache: {e}")
+
+def _remember_result(url, df):
+    """
+    Stores a scraped DataFrame in the in-process cache
+    
+    Args:
+        url (str): The scraped URL
+        df (pandas.DataFrame): Data to cache
+    
+    Returns:
+        pandas.DataFrame: A copy so callers can't alter the cached frame
+    """
+    _RESULT_CACHE[url] = (time.monotonic(), df)
+    return df.copy()
 
 def scrape_weekly_show_data(url):
     """
@@ -14,87 +285,76 @@ def scrape_weekly_show_data(url):
     Returns:
         pandas.DataFrame: DataFrame containing the scraped data
     """
+    # Reuse a recent result from this process if there is one
+    if url in _RESULT_CACHE:
+        cached_at, cached_df = _RESULT_CACHE[url]
+        if time.monotonic() - cached_at < _RESULT_TTL:
+            return cached_df.copy()
+        del _RESULT_CACHE[url]
+    
     try:
+        # Ask the server to skip the body if the page hasn't changed
+        cached = _load_http_cache().get(url, {})
+        headers = {}
+        if os.path.exists(cached.get('frame', '')):
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
         # Fetch the webpage
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
+        response = _SESSION.get(url, headers=headers, timeout=10, stream=True)
         response.raise_for_status()  # Raises an HTTPError for bad responses
         
-        # Parse the HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        if response.status_code == 304:
+            response.close()
+            try:
+                cached_df = pd.read_pickle(cached['frame'])
+            except Exception as e:
+                # Drop the unusable entry so later calls don't keep getting 304s,
+                # then fetch the full page once without the validators
+                print(f"Warning: Could not load cached data, fetching the page again: {e}")
+                _forget_http_cache(url)
+                response = _SESSION.get(url, timeout=10, stream=True)
+                response.raise_for_status()
+            else:
+                print("Page unchanged since last scrape, using cached data")
+                return _remember_result(url, cached_df)
+        
+        # Decode the body as it arrives so only the text copy is held in memory;
+        # the first chunk is used to find the charset if the header lacks one
+        chunks = response.iter_content(chunk_size=65536)
+        head = next(chunks, b'')
+        decoder = codecs.getincrementaldecoder(_page_encoding(response, head))(errors='replace')
+        page_html = decoder.decode(head) + ''.join(decoder.decode(chunk) for chunk in chunks) + decoder.decode(b'', final=True)
         
         # Extract data - Method 1: Using regex patterns
-        text_content = soup.get_text()
-        
-        # Define regex patterns for all data points
-        week_pattern = r'Week Ending:\s*(\d{1,2}/\d{1,2}/\d{4})'
-        shows_pattern = r'Number of Shows:\s*(\d+)'
-        gross_pattern = r'Gross Gross:\s*\$?([\d,]+)'
-        attendance_pattern = r'Total Attendance:\s*([\d,]+)'
-        
-        # Find all instances of each data type
-        weeks = re.findall(week_pattern, text_content)
-        shows = re.findall(shows_pattern, text_content)
-        gross = re.findall(gross_pattern, text_content)
-        attendance = re.findall(attendance_pattern, text_content)
-        
-        # Debug: Print what was found
-        print(f"Found {len(weeks)} weeks, {len(shows)} shows, {len(gross)} gross, {len(attendance)} attendance")
-        
-        # Alternative Method 2: If data is in specific HTML elements
-        # Uncomment and modify these lines if the above regex doesn't work well
-        """
-        weeks = []
-        shows = []
-        gross = []
-        attendance = []
-        
-        # Method 2a: Look for text patterns in HTML elements
-        for element in soup.find_all(text=re.compile(r'Week Ending:')):
-            week_match = re.search(r'Week Ending:\s*(\d{1,2}/\d{1,2}/\d{4})', element)
-            if week_match:
-                weeks.append(week_match.group(1))
-        
-        for element in soup.find_all(text=re.compile(r'Number of Shows:')):
-            shows_match = re.search(r'Number of Shows:\s*(\d+)', element)
-            if shows_match:
-                shows.append(shows_match.group(1))
-        
-        for element in soup.find_all(text=re.compile(r'Gross Gross:')):
-            gross_match = re.search(r'Gross Gross:\s*\$?([\d,]+)', element)
-            if gross_match:
-                gross.append(gross_match.group(1))
-        
-        for element in soup.find_all(text=re.compile(r'Total Attendance:')):
-            attendance_match = re.search(r'Total Attendance:\s*([\d,]+)', element)
-            if attendance_match:
-                attendance.append(attendance_match.group(1))
-        
-        # Method 2b: If data is in structured HTML (like tables or specific divs)
-        # Example for table structure:
-        # for row in soup.find_all('tr'):  # or 'div', 'li', etc.
-        #     cells = row.find_all('td')  # or whatever contains the data
-        #     if len(cells) >= 4:
-        #         weeks.append(extract_date_from_cell(cells[0]))
-        #         shows.append(extract_number_from_cell(cells[1]))
-        #         gross.append(extract_currency_from_cell(cells[2]))
-        #         attendance.append(extract_number_from_cell(cells[3]))
-        """
+        # The labels survive in the raw HTML, so strip tags in one pass
+        # instead of building a full parse tree just to flatten it again;
+        # tags are dropped without a separator, as get_text() does
+        text_content = html.unescape(_TAG_RE.sub('', page_html))
+        
+        # Find all instances of each data type in a single pass
+        weeks, shows, gross, attendance = _scan_labels([text_content])
+        
+        # Debug: Log what was found
+        _log.debug("Found %d weeks, %d shows, %d gross, %d attendance", len(weeks), len(shows), len(gross), len(attendance))
+        
+        # Alternative Method 2: Look for the labels inside individual HTML text
+        # nodes, only paying for a (strained) parse when Method 1 found nothing
+        if not any([weeks, shows, gross, attendance]):
+            soup = BeautifulSoup(page_html, _HTML_PARSER, parse_only=_LABEL_STRAINER)
+            weeks, shows, gross, attendance = _scan_labels(soup.find_all(string=True))
         
         # Check if any data was found
         if not any([weeks, shows, gross, attendance]):
             print("No data found with current regex patterns. The website structure may have changed.")
-            # Save the HTML content for debugging
+            # Save the page text for debugging
             with open('debug_html.txt', 'w', encoding='utf-8') as f:
                 f.write(text_content[:5000])  # First 5000 characters
             print("First 5000 characters of webpage saved to debug_html.txt for inspection")
             return pd.DataFrame()
         
-        # Create DataFrame with all four columns
-        data = []
-        
         # Check if all lists have the same length
         if not (len(weeks) == len(shows) == len(gross) == len(attendance)):
             print(f"Warning: Mismatched data counts - Weeks: {len(weeks)}, Shows: {len(shows)}, Gross: {len(gross)}, Attendance: {len(attendance)}")
@@ -107,35 +367,45 @@ def scrape_weekly_show_data(url):
             print("No matching data found for all required fields.")
             return pd.DataFrame()
         
-        for i in range(min_length):
-            try:
-                # Clean up the data
-                clean_gross = gross[i].replace(',', '')  # Remove commas from gross
-                clean_attendance = attendance[i].replace(',', '')  # Remove commas from attendance
-                
-                data.append({
-                    'Week_Ending': weeks[i],
-                    'Gross_Gross': int(clean_gross),
-                    'Total_Attendance': int(clean_attendance),
-                    'Number_of_Shows': int(shows[i]),
-                    'Scraped_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
-            except ValueError as e:
-                print(f"Error converting data at index {i}: {e}")
-                continue
-        
-        df = pd.DataFrame(data)
-        
-        # Convert Week_Ending to datetime for better Excel formatting
-        if not df.empty:
-            try:
-                df['Week_Ending'] = pd.to_datetime(df['Week_Ending'])
-                # Sort by week ending date (newest first)
-                df = df.sort_values('Week_Ending', ascending=False).reset_index(drop=True)
-            except Exception as e:
-                print(f"Warning: Could not convert dates: {e}")
+        # Clean up the data column by column (remove commas from gross and attendance)
+        gross_col, bad_gross = _to_int_column(gross[:min_length])
+        attendance_col, bad_attendance = _to_int_column(attendance[:min_length])
+        shows_col, bad_shows = _to_int_column(shows[:min_length])
         
-        return df
+        # Skip only the rows with a value that couldn't be converted
+        bad = bad_gross | bad_attendance | bad_shows
+        for i in np.flatnonzero(bad):
+            print(f"Error converting data at index {i}: gross={gross[i]!r}, attendance={attendance[i]!r}, shows={shows[i]!r}")
+        keep = ~bad
+        
+        if not keep.any():
+            print("No matching data found for all required fields.")
+            return pd.DataFrame()
+        
+        # Week_Ending is parsed straight to datetime for better Excel formatting
+        weeks_col = pd.to_datetime(weeks[:min_length], format='%m/%d/%Y', cache=True, errors='coerce')[keep]
+        
+        # Narrow dtypes where the values allow it: weekly attendance normally
+        # fits in int32 and a week never has more than a few dozen performances
+        df = pd.DataFrame({
+            'Week_Ending': weeks_col,
+            'Gross_Gross': gross_col[keep],
+            'Total_Attendance': _narrow_int(attendance_col[keep], 'int32'),
+            'Number_of_Shows': _narrow_int(shows_col[keep], 'int16')
+        })
+        # Every row shares the same timestamp, so store it as a one-category column
+        scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df['Scraped_Date'] = pd.Categorical.from_codes(np.zeros(len(df), dtype='int8'), categories=[scraped_at])
+        
+        # Sort by week ending date (newest first); the page is normally already
+        # in date order, so a reverse slice or no-op avoids a full sort
+        if df['Week_Ending'].is_monotonic_increasing:
+            df = df.iloc[::-1].reset_index(drop=True)
+        elif not df['Week_Ending'].is_monotonic_decreasing:
+            df = df.sort_values('Week_Ending', ascending=False).reset_index(drop=True)
+        
+        _save_http_cache(url, response, df)
+        return _remember_result(url, df)
         
     except requests.RequestException as e:
         print(f"Error fetching the webpage: {e}")
@@ -157,7 +427,7 @@ def save_to_excel(df, filename=None):
     
     try:
         # Save to Excel with formatting
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
             df.to_excel(writer, sheet_name='Weekly Shows', index=False)
             
             # Get the workbook and worksheet
@@ -165,32 +435,15 @@ def save_to_excel(df, filename=None):
             worksheet = writer.sheets['Weekly Shows']
             
             # Format currency and number columns in Excel
-            from openpyxl.styles import NamedStyle
-            
-            # Create currency style
-            currency_style = NamedStyle(name='currency')
-            currency_style.number_format = '"$"#,##0'
-            
-            # Create number style with commas
-            number_style = NamedStyle(name='number_comma')
-            number_style.number_format = '#,##0'
-            
-            # Apply formatting to columns
-            for row in range(2, len(df) + 2):  # Start from row 2 (skip header)
-                worksheet[f'B{row}'].style = currency_style  # Gross_Gross column
-                worksheet[f'C{row}'].style = number_style    # Total_Attendance column
-            
-            # Set column widths
-            column_widths = {
-                'A': 15,  # Week_Ending
-                'B': 15,  # Gross_Gross
-                'C': 18,  # Total_Attendance
-                'D': 15,  # Number_of_Shows
-                'E': 20   # Scraped_Date
-            }
+            currency_format = workbook.add_format({'num_format': '"$"#,##0'})
+            number_format = workbook.add_format({'num_format': '#,##0'})
             
-            for col_letter, width in column_widths.items():
-                worksheet.column_dimensions[col_letter].width = width
+            # Set column widths and formats, one call per column
+            worksheet.set_column('A:A', 15)                   # Week_Ending
+            worksheet.set_column('B:B', 15, currency_format)  # Gross_Gross
+            worksheet.set_column('C:C', 18, number_format)    # Total_Attendance
+            worksheet.set_column('D:D', 15)                   # Number_of_Shows
+            worksheet.set_column('E:E', 20)                   # Scraped_Date
         
         print(f"Data saved to {filename}")
         return filename